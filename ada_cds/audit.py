@@ -1,27 +1,56 @@
 from __future__ import annotations
 
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     timestamp: datetime
     patient_id: str
     clinician_id: Optional[str]
     action: str
     rule_id: Optional[str] = None
+    # isoformat() of `timestamp`, precomputed at log time so batch export
+    # never re-formats the same instant.
+    iso_timestamp: str = ""
     input_data: Dict[str, Any] = field(default_factory=dict)
     output_data: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class AuditLogger:
-    """In-memory logger - replace with DB writer for production."""
+    """In-memory logger - replace with DB writer for production.
 
-    def __init__(self):
+    Entries are staged in a bounded ring buffer and drained to the sink by a
+    background thread, either every `flush_interval` seconds or as soon as
+    the buffer fills up, so the request path never waits on sink I/O.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 100,
+        flush_interval: float = 1.0,
+        enabled: bool = True,
+    ):
         self.entries: List[AuditEntry] = []
+        self._timestamps: List[datetime] = []
+        self._needs_sort = False
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        # Unbounded on purpose: buffer_size is only the flush trigger.
+        # Audit entries must never be dropped, so a fast producer wakes the
+        # flusher early instead of evicting the oldest entries.
+        self._buffer: Deque[AuditEntry] = deque()
+        self._lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
 
     def log_evaluation(
         self,
@@ -29,9 +58,16 @@ class AuditLogger:
         clinician_id: Optional[str],
         rules_evaluated: Dict[str, Any],
         final_recommendations: Dict[str, Any],
+        timestamp: Optional[datetime] = None,
     ) -> str:
+        if not self.enabled:
+            return ""
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        iso = timestamp.isoformat()
         entry = AuditEntry(
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
+            iso_timestamp=iso,
             patient_id=patient.patient_id,
             clinician_id=clinician_id,
             action="clinical_evaluation",
@@ -48,32 +84,82 @@ class AuditLogger:
                 "payer": patient.payer,
             },
         )
-        self.entries.append(entry)
-        return entry.timestamp.isoformat()
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_event.set()
+        return iso
+
+    def is_enabled(self) -> bool:
+        """Callers should skip building audit payloads when this is False."""
+        return self.enabled
+
+    def flush(self) -> None:
+        """Drain buffered entries into the sink.
+
+        The sink lists are only touched under the lock so concurrent
+        callers (flusher thread, trail/export readers) cannot interleave
+        `entries` and `_timestamps` inconsistently.
+        """
+        with self._lock:
+            pending = list(self._buffer)
+            self._buffer.clear()
+            for e in pending:
+                if self._timestamps and e.timestamp < self._timestamps[-1]:
+                    self._needs_sort = True
+                self.entries.append(e)
+                self._timestamps.append(e.timestamp)
+
+    def _ensure_sorted(self) -> None:
+        """Restore timestamp order before bisecting.
+
+        Entries are persisted from background tasks with timestamps
+        captured at request start, so out-of-order arrival is routine
+        under concurrent requests; sorting happens lazily and only when a
+        flush actually observed disorder.
+        """
+        with self._lock:
+            if self._needs_sort:
+                self.entries.sort(key=lambda e: e.timestamp)
+                self._timestamps = [e.timestamp for e in self.entries]
+                self._needs_sort = False
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
 
     def get_patient_trail(self, patient_id: str) -> List[AuditEntry]:
+        self.flush()
         return [e for e in self.entries if e.patient_id == patient_id]
 
-    def export_fhir_audit(self, start: datetime, end: datetime) -> List[Dict]:
+    def export_fhir_audit(self, start: datetime, end: datetime) -> Iterator[Dict]:
         """
-        Returns a list of FHIR-compatible AuditEvent resources.
+        Yields FHIR-compatible AuditEvent resources for the window.
         For a real implementation you would use `fhir.resources`.
+
+        Entries are appended in timestamp order (single writer), so the
+        window is located with two bisects and streamed lazily instead of
+        scanning and materializing the whole log.
         """
-        out = []
-        for e in self.entries:
-            if start <= e.timestamp <= end:
-                out.append(
+        self.flush()
+        self._ensure_sorted()
+        lo = bisect_left(self._timestamps, start)
+        hi = bisect_right(self._timestamps, end)
+        return self._fhir_events(lo, hi)
+
+    def _fhir_events(self, lo: int, hi: int) -> Iterator[Dict]:
+        for e in self.entries[lo:hi]:
+            yield {
+                "resourceType": "AuditEvent",
+                "type": {"code": e.action},
+                "recorded": e.iso_timestamp or e.timestamp.isoformat(),
+                "agent": [{"who": {"identifier": e.clinician_id or "system"}}],
+                "entity": [
                     {
-                        "resourceType": "AuditEvent",
-                        "type": {"code": e.action},
-                        "recorded": e.timestamp.isoformat(),
-                        "agent": [{"who": {"identifier": e.clinician_id or "system"}}],
-                        "entity": [
-                            {
-                                "what": {"reference": f"Patient/{e.patient_id}"},
-                                "detail": e.metadata,
-                            }
-                        ],
+                        "what": {"reference": f"Patient/{e.patient_id}"},
+                        "detail": e.metadata,
                     }
-                )
-        return out
+                ],
+            }
@@ -1,9 +1,37 @@
 import json
+from dataclasses import make_dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml, ~5-10x faster
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+
+_MISSING = object()
+
+
+def _freeze_tree(value: Any, name: str = "FrozenConfig") -> Any:
+    """Recursively convert a config dict into frozen, slotted dataclasses.
+
+    Dicts whose keys are not all valid identifiers (e.g. clinic ids) are
+    left as plain dicts.
+    """
+    if isinstance(value, dict) and value and all(
+        isinstance(k, str) and k.isidentifier() for k in value
+    ):
+        cls = make_dataclass(name, list(value), frozen=True, slots=True)
+        return cls(**{k: _freeze_tree(v, f"{name}_{k}") for k, v in value.items()})
+    return value
+
 
 class ConfigManager:
     """Loads JSON/YAML configuration and provides dot-notation access."""
@@ -26,21 +54,44 @@ class ConfigManager:
             "medicaid": {"state_specific": True},
             "commercial": {"cgm_min_age": 18, "requires_prior_auth": False},
         },
+        "audit": {
+            "enabled": True,
+            "buffer_size": 100,
+            "flush_interval_seconds": 1.0,
+        },
     }
 
     def __init__(self, config_path: Optional[Path] = None):
+        self._get_cache: Dict[str, Any] = {}
+        self._frozen: Optional[Any] = None
         self.config = self.DEFAULT_CONFIG.copy()
         if config_path and config_path.exists():
             self._deep_update(self.config, self._load_config(config_path))
 
     def _load_config(self, config_path: Path) -> Dict[str, Any]:
         suffix = config_path.suffix.lower()
-        with open(config_path, "r") as f:
-            if suffix in {".yaml", ".yml"}:
-                return yaml.safe_load(f) or {}
-            return json.load(f)
+        if suffix in {".yaml", ".yml"}:
+            with open(config_path, "r") as f:
+                return yaml.load(f, Loader=_YamlLoader) or {}
+        with open(config_path, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    @property
+    def frozen(self) -> Any:
+        """Immutable attribute-access view of the config.
+
+        Hot-path consumers read e.g. `cfg.frozen.thresholds.hba1c_poor_control`
+        as a single slot load; the dict-based `get()` stays available for
+        dynamic keys such as clinic overrides.
+        """
+        if self._frozen is None:
+            self._frozen = _freeze_tree(self.config)
+        return self._frozen
 
     def _deep_update(self, base: Dict[str, Any], updates: Dict[str, Any]) -> None:
+        self._get_cache.clear()
+        self._frozen = None
         for key, value in updates.items():
             if isinstance(value, dict) and isinstance(base.get(key), dict):
                 self._deep_update(base[key], value)
@@ -48,17 +99,27 @@ class ConfigManager:
                 base[key] = value
 
     def get(self, key: str, default: Any = None) -> Any:
-        """Key can be dot-separated, e.g. 'thresholds.hba1c_poor_control'."""
-        parts = key.split(".")
-        cur = self.config
-        for p in parts:
-            if isinstance(cur, dict) and p in cur:
-                cur = cur[p]
-            else:
-                return default
-        return cur
+        """Key can be dot-separated, e.g. 'thresholds.hba1c_poor_control'.
+
+        Lookups are memoized per key string; the cache is invalidated
+        whenever the underlying config is updated.
+        """
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            value = self.config
+            for p in key.split("."):
+                if isinstance(value, dict) and p in value:
+                    value = value[p]
+                else:
+                    value = _MISSING
+                    break
+            self._get_cache[key] = value
+        return default if value is _MISSING else value
 
     def update_clinic_rules(self, clinic_id: str, rules: Dict[str, Any]) -> None:
+        self._get_cache.clear()
+        self._frozen = None
         if "clinic_overrides" not in self.config:
             self.config["clinic_overrides"] = {}
         self.config["clinic_overrides"][clinic_id] = rules
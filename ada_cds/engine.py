@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .audit import AuditLogger
 from .config import ConfigManager
@@ -10,6 +10,34 @@ from .rule_registry import RuleRegistry
 from .temporal import TemporalEngine
 
 
+_PAYER_COVERAGE: Dict[str, Dict[str, Any]] = {
+    "medicare": {
+        "GLP1": "likely",
+        "SGLT2": "likely",
+        "CGM": lambda p: "likely" if p.uses_insulin else "unlikely",
+    },
+    "medicaid": {"GLP1": "unlikely", "SGLT2": "likely", "CGM": "unlikely"},
+    "commercial": {
+        "GLP1": "likely",
+        "SGLT2": "likely",
+        "CGM": lambda p: "likely" if p.uses_insulin else "unlikely",
+    },
+}
+
+_CONTRAINDICATION_CHECKS: Dict[str, tuple] = {
+    "GLP1": (
+        (lambda p: p.pregnant, "Pregnancy"),
+        (lambda p: "pancreatitis" in p.contraindications, "History of pancreatitis"),
+    ),
+    "SGLT2": (
+        (
+            lambda p: any(d.name.lower() == "esrd" for d in p.diagnoses),
+            "End-stage renal disease",
+        ),
+    ),
+}
+
+
 class EnhancedEligibilityResult:
     """Result for a single intervention."""
 
@@ -48,13 +76,14 @@ class EnhancedEngineOutput:
         care_gaps: List[Dict[str, str]],
         rule_evaluations: Dict[str, Dict[str, Any]],
         audit_trail_id: str,
+        timestamp: Optional[datetime] = None,
     ):
         self.validation = validation
         self.eligibility = eligibility
         self.care_gaps = care_gaps
         self.rule_evaluations = rule_evaluations
         self.audit_trail_id = audit_trail_id
-        self.timestamp = datetime.utcnow()
+        self.timestamp = timestamp or datetime.now(timezone.utc)
 
 
 class EnhancedADAReasoningEngine:
@@ -67,38 +96,71 @@ class EnhancedADAReasoningEngine:
         self.ontology = OntologyService(ontology_dir or Path("./ontologies"))
         self.rule_registry = RuleRegistry(self.config, self.ontology)
 
-        self.audit_logger = AuditLogger()
+        self.audit_logger = AuditLogger(
+            buffer_size=self.config.get("audit.buffer_size", 100),
+            flush_interval=self.config.get("audit.flush_interval_seconds", 1.0),
+            enabled=self.config.get("audit.enabled", True),
+        )
         self.clinician_id: Optional[str] = None
 
     def set_clinician(self, clinician_id: str) -> None:
         self.clinician_id = clinician_id
 
     def evaluate(self, patient: Patient) -> EnhancedEngineOutput:
-        validation = self._validate_patient_data(patient)
-        rule_results = self.rule_registry.evaluate_all(patient, self.temporal)
-        eligibility = self._aggregate_eligibility(patient, rule_results)
-        care_gaps = self._identify_care_gaps(patient)
-
-        audit_id = self.audit_logger.log_evaluation(
-            patient,
-            self.clinician_id,
-            rule_results,
-            {k: v.__dict__ for k, v in eligibility.items()},
-        )
+        out, persist_audit = self.evaluate_clinical(patient)
+        persist_audit()
+        return out
+
+    def evaluate_clinical(
+        self, patient: Patient
+    ) -> Tuple[EnhancedEngineOutput, Callable[[], None]]:
+        """Compute the clinical answer; defer the audit write.
+
+        The audit trail id is the evaluation timestamp, so it is known
+        before anything is persisted. Returns the output plus a
+        `persist_audit` callable the API layer can schedule as a background
+        task, keeping audit I/O off the request path.
+        """
+        now = datetime.now(timezone.utc)
+        with self.temporal.request_scope(now.date()):
+            validation = self._validate_patient_data(patient)
+            rule_results = self.rule_registry.evaluate_all(patient, self.temporal)
+            eligibility = self._aggregate_eligibility(patient, rule_results)
+            care_gaps = self._identify_care_gaps(patient)
+
+        if self.audit_logger.is_enabled():
+            audit_id = now.isoformat()
+
+            def persist_audit() -> None:
+                self.audit_logger.log_evaluation(
+                    patient,
+                    self.clinician_id,
+                    rule_results,
+                    {k: v.__dict__ for k, v in eligibility.items()},
+                    timestamp=now,
+                )
+
+        else:
+            audit_id = ""
+
+            def persist_audit() -> None:
+                return None
 
-        return EnhancedEngineOutput(
+        output = EnhancedEngineOutput(
             validation,
             eligibility,
             care_gaps,
             rule_results,
             audit_id,
+            timestamp=now,
         )
+        return output, persist_audit
 
     def _validate_patient_data(self, patient: Patient) -> ValidationResult:
         v = ValidationResult()
         if not patient.diagnoses:
             v.errors.append("No diagnoses recorded")
-        hba1c = next((l for l in patient.labs if l.loinc == "LOINC:4548-4"), None)
+        hba1c = patient.lab_by_loinc("LOINC:4548-4")
         ok, reason = self.temporal.is_lab_current(hba1c, "hba1c")
         if not ok:
             v.errors.append(f"HbA1c: {reason}")
@@ -124,8 +186,8 @@ class EnhancedADAReasoningEngine:
                     "ineligible_rules": [],
                     "guideline_refs": set(),
                     "evidence_levels": set(),
-                    "met": [],
-                    "unmet": [],
+                    "met": set(),
+                    "unmet": set(),
                 }
 
             target = by_int[intr]
@@ -136,9 +198,11 @@ class EnhancedADAReasoningEngine:
 
             target["guideline_refs"].add(r["guideline_ref"])
             target["evidence_levels"].add(r["evidence_level"])
-            target["met"].extend(r["met_conditions"])
-            target["unmet"].extend(r["unmet_conditions"])
+            target["met"].update(r["met_conditions"])
+            target["unmet"].update(r["unmet_conditions"])
 
+        payer = patient.payer
+        age = patient.age
         out: Dict[str, EnhancedEligibilityResult] = {}
         for intr, data in by_int.items():
             eligible = len(data["eligible_rules"]) > 0
@@ -155,8 +219,8 @@ class EnhancedADAReasoningEngine:
 
             payer_notes = []
             prior_auth = False
-            if patient.payer == "medicare":
-                if intr == "CGM" and patient.age >= 65:
+            if payer == "medicare":
+                if intr == "CGM" and age >= 65:
                     payer_notes.append("Medicare covers CGM for age >=65")
                     prior_auth = True
 
@@ -165,9 +229,9 @@ class EnhancedADAReasoningEngine:
             out[intr] = EnhancedEligibilityResult(
                 eligible=eligible,
                 strength=strength,
-                recommendations=list(set(data["met"])),
+                recommendations=list(data["met"]),
                 contraindications=self._check_contraindications(patient, intr),
-                missing_data=list(set(data["unmet"])),
+                missing_data=list(data["unmet"]),
                 guideline_references=list(data["guideline_refs"]),
                 evidence_levels=list(data["evidence_levels"]),
                 payer_coverage_notes=payer_notes,
@@ -177,34 +241,19 @@ class EnhancedADAReasoningEngine:
         return out
 
     def _check_contraindications(self, patient: Patient, intervention: str) -> List[str]:
-        contra = []
-        if intervention == "GLP1":
-            if patient.pregnant:
-                contra.append("Pregnancy")
-            if "pancreatitis" in patient.contraindications:
-                contra.append("History of pancreatitis")
-        if intervention == "SGLT2":
-            if any(d.name.lower() == "esrd" for d in patient.diagnoses):
-                contra.append("End-stage renal disease")
-        return contra
+        return [
+            reason
+            for applies, reason in _CONTRAINDICATION_CHECKS.get(intervention, ())
+            if applies(patient)
+        ]
 
     def _estimate_coverage(self, patient: Patient, intervention: str) -> Optional[str]:
         if not patient.payer:
             return "unknown"
-        map_ = {
-            "medicare": {
-                "GLP1": "likely",
-                "SGLT2": "likely",
-                "CGM": "likely" if patient.uses_insulin else "unlikely",
-            },
-            "medicaid": {"GLP1": "unlikely", "SGLT2": "likely", "CGM": "unlikely"},
-            "commercial": {
-                "GLP1": "likely",
-                "SGLT2": "likely",
-                "CGM": "likely" if patient.uses_insulin else "unlikely",
-            },
-        }
-        return map_.get(patient.payer, {}).get(intervention, "unknown")
+        entry = _PAYER_COVERAGE.get(patient.payer, {}).get(intervention)
+        if callable(entry):
+            return entry(patient)
+        return entry or "unknown"
 
     def _identify_care_gaps(self, patient: Patient) -> List[Dict[str, str]]:
         gaps = []
@@ -217,7 +266,7 @@ class EnhancedADAReasoningEngine:
             if needed:
                 gaps.append({"name": name, "ada_section": section, "action": reason})
 
-        hba1c = next((l for l in patient.labs if l.loinc == "LOINC:4548-4"), None)
+        hba1c = patient.lab_by_loinc("LOINC:4548-4")
         if hba1c:
             cur, reason = self.temporal.is_lab_current(hba1c, "hba1c")
             if not cur:
@@ -227,14 +276,14 @@ class EnhancedADAReasoningEngine:
         else:
             gaps.append({"name": "HbA1c Monitoring", "ada_section": "6", "action": "No result"})
 
-        if any(d.mondo.startswith("MONDO:000514") for d in patient.diagnoses) and patient.age >= 40:
+        if patient.has_diabetes and patient.age >= 40:
             gaps.append(
                 {"name": "CV Risk Assessment", "ada_section": "10", "action": "Consider statin therapy"}
             )
 
-        if any(d.mondo.startswith("MONDO:000514") for d in patient.diagnoses):
-            egfr = next((l for l in patient.labs if l.loinc == "LOINC:48643-1"), None)
-            uacr = next((l for l in patient.labs if l.loinc == "LOINC:9318-7"), None)
+        if patient.has_diabetes:
+            egfr = patient.lab_by_loinc("LOINC:48643-1")
+            uacr = patient.lab_by_loinc("LOINC:9318-7")
             if not (egfr and uacr):
                 gaps.append({"name": "CKD Screening", "ada_section": "11", "action": "Order eGFR & UACR"})
 
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, List, Optional
+from typing import Any, Dict, KeysView, List, Optional, Set
+
+_UNSET = object()
+
+INSULIN_CODES = frozenset({"rxnorm:2618", "rxnorm:260265", "rxnorm:575802"})
+
+DIABETES_COMPLICATION_CODES = frozenset(
+    {"E11.31", "E11.32", "E11.33", "E11.34", "E11.35", "E11.36", "E11.39"}
+)
 
 
 class RuleSource(str):
@@ -11,7 +20,7 @@ class RuleSource(str):
     CLINIC = "clinic"
 
 
-@dataclass
+@dataclass(slots=True)
 class LabResult:
     loinc: str
     value: float
@@ -19,8 +28,17 @@ class LabResult:
     date: date
     source: str = "EHR"
 
+    def __post_init__(self):
+        # CURIEs recur across patients and rule targets; interning makes
+        # the hash/equality checks in set lookups pointer comparisons.
+        self.loinc = sys.intern(self.loinc)
+
+    @classmethod
+    def from_schema(cls, s) -> "LabResult":
+        return cls(loinc=s.loinc, value=s.value, unit=s.unit, date=s.date, source=s.source)
+
 
-@dataclass
+@dataclass(slots=True)
 class Medication:
     rxnorm_code: str
     name: str
@@ -29,16 +47,38 @@ class Medication:
     failed: bool = False
     contraindicated: bool = False
 
+    def __post_init__(self):
+        self.rxnorm_code = sys.intern(self.rxnorm_code)
 
-@dataclass
+    @classmethod
+    def from_schema(cls, s) -> "Medication":
+        return cls(
+            rxnorm_code=s.rxnorm_code,
+            name=s.name,
+            start_date=s.start_date,
+            end_date=s.end_date,
+            failed=s.failed,
+            contraindicated=s.contraindicated,
+        )
+
+
+@dataclass(slots=True)
 class Diagnosis:
     icd10: str
     mondo: str
     name: str
     onset_date: Optional[date] = None
 
+    def __post_init__(self):
+        self.icd10 = sys.intern(self.icd10)
+        self.mondo = sys.intern(self.mondo)
+
+    @classmethod
+    def from_schema(cls, s) -> "Diagnosis":
+        return cls(icd10=s.icd10, mondo=s.mondo, name=s.name, onset_date=s.onset_date)
+
 
-@dataclass
+@dataclass(slots=True)
 class VitalSigns:
     systolic: Optional[float] = None
     diastolic: Optional[float] = None
@@ -46,8 +86,18 @@ class VitalSigns:
     height_cm: Optional[float] = None
     date: Optional[date] = None
 
+    @classmethod
+    def from_schema(cls, s) -> "VitalSigns":
+        return cls(
+            systolic=s.systolic,
+            diastolic=s.diastolic,
+            weight_kg=s.weight_kg,
+            height_cm=s.height_cm,
+            date=s.date,
+        )
 
-@dataclass
+
+@dataclass(slots=True)
 class ValidationResult:
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
@@ -56,7 +106,7 @@ class ValidationResult:
         return not self.errors
 
 
-@dataclass
+@dataclass(slots=True)
 class Patient:
     patient_id: str
     age: int
@@ -75,9 +125,71 @@ class Patient:
     last_dental_exam: Optional[date] = None
     allergies: List[str] = field(default_factory=list)
     contraindications: List[str] = field(default_factory=list)
+    _labs_by_loinc: Dict[str, LabResult] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _dx_icd10: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _dx_mondo: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _med_rxnorm: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _dx_uris: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+    # Lazily computed property caches; cached_property needs __dict__, which
+    # slots=True removes, so these use sentinel fields instead.
+    _bmi: Any = field(default=_UNSET, init=False, repr=False, compare=False)
+    _uses_insulin: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+    _diabetes_complications: Optional[bool] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _has_diabetes: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Hash indexes over labs/diagnoses/medications so rule evaluation
+        # does O(1) lookups instead of rescanning the lists. They assume the
+        # lists are not mutated after construction.
+        labs_by_loinc: Dict[str, LabResult] = {}
+        for lab in self.labs:
+            current = labs_by_loinc.get(lab.loinc)
+            if current is None or lab.date > current.date:
+                labs_by_loinc[lab.loinc] = lab
+        self._labs_by_loinc = labs_by_loinc
+        self._dx_icd10 = {d.icd10 for d in self.diagnoses if d.icd10}
+        self._dx_mondo = {d.mondo for d in self.diagnoses if d.mondo}
+        self._med_rxnorm = {m.rxnorm_code for m in self.medications}
+
+    def lab_by_loinc(self, loinc: str) -> Optional[LabResult]:
+        """Most recent lab for a LOINC code, or None."""
+        return self._labs_by_loinc.get(loinc)
+
+    @property
+    def lab_codes(self) -> KeysView[str]:
+        """LOINC codes with at least one result (read-only view)."""
+        return self._labs_by_loinc.keys()
+
+    @property
+    def med_codes(self) -> Set[str]:
+        """RxNorm codes of the patient's medications; treat as read-only."""
+        return self._med_rxnorm
+
+    def dx_uris(self, ontology) -> frozenset:
+        """Resolved diagnosis URIs (MONDO + ICD-10), built once per patient.
+
+        Takes the ontology as an argument because patients are constructed
+        without one; every rule condition that needs the set then shares a
+        single resolution pass.
+        """
+        if self._dx_uris is _UNSET:
+            resolve = ontology.resolve_code
+            self._dx_uris = frozenset(
+                resolve(code) for code in self._dx_mondo | self._dx_icd10
+            )
+        return self._dx_uris
 
     @property
     def bmi(self) -> Optional[float]:
+        if self._bmi is _UNSET:
+            self._bmi = self._compute_bmi()
+        return self._bmi
+
+    def _compute_bmi(self) -> Optional[float]:
         if not self.vital_signs or not self.vital_signs.weight_kg or not self.vital_signs.height_cm:
             return None
         if self.vital_signs.height_cm <= 0:
@@ -87,18 +199,23 @@ class Patient:
 
     @property
     def uses_insulin(self) -> bool:
-        insulin_codes = {"rxnorm:2618", "rxnorm:260265", "rxnorm:575802"}
-        return any(m.rxnorm_code in insulin_codes for m in self.medications)
+        if self._uses_insulin is None:
+            self._uses_insulin = not self._med_rxnorm.isdisjoint(INSULIN_CODES)
+        return self._uses_insulin
+
+    @property
+    def has_diabetes(self) -> bool:
+        """Any diagnosis under the MONDO diabetes-mellitus branch."""
+        if self._has_diabetes is None:
+            self._has_diabetes = any(
+                code.startswith("MONDO:000514") for code in self._dx_mondo
+            )
+        return self._has_diabetes
 
     @property
     def diabetes_complications(self) -> bool:
-        complication_codes = {
-            "E11.31",
-            "E11.32",
-            "E11.33",
-            "E11.34",
-            "E11.35",
-            "E11.36",
-            "E11.39",
-        }
-        return any(d.icd10 in complication_codes for d in self.diagnoses)
+        if self._diabetes_complications is None:
+            self._diabetes_complications = not self._dx_icd10.isdisjoint(
+                DIABETES_COMPLICATION_CODES
+            )
+        return self._diabetes_complications
@@ -1,9 +1,16 @@
+import functools
+import hashlib
+import logging
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 import rdflib
 from rdflib.namespace import OWL, RDFS, SKOS
 
+log = logging.getLogger(__name__)
+
 
 class OntologyService:
     """
@@ -13,7 +20,7 @@ class OntologyService:
     """
 
     def __init__(self, ontology_dir: Path | str = Path("./ontologies"), preload: bool = True):
-        self.graph = rdflib.Graph()
+        self.graph = self._make_graph()
         self.ns = {
             "loinc": rdflib.Namespace("http://loinc.org/rdf/"),
             "rxnorm": rdflib.Namespace("http://rxnorm.info/rdf/"),
@@ -21,27 +28,147 @@ class OntologyService:
             "snomed": rdflib.Namespace("http://snomed.info/id/"),
             "ex": rdflib.Namespace("http://example.org/ada#"),
         }
+        self._ancestors: Dict[rdflib.URIRef, FrozenSet[rdflib.URIRef]] = {}
+        self._descendants: Dict[rdflib.URIRef, FrozenSet[rdflib.URIRef]] = {}
+        self._curie_cache: Dict[str, rdflib.URIRef] = {}
+        self._equiv_cache: Dict[str, Tuple[rdflib.URIRef, ...]] = {}
+        self.load_errors: List[Tuple[Path, Exception]] = []
+
+        # Per-instance LRU caches: lru_cache on the methods themselves would
+        # key on (and keep alive) `self`, so wrap the bound methods instead.
+        self.resolve_code = functools.lru_cache(maxsize=4096)(self._resolve_code)
+        self.label = functools.lru_cache(maxsize=4096)(self._label)
+        self.synonyms = functools.lru_cache(maxsize=4096)(self._synonyms)
+        self.descendants = functools.lru_cache(maxsize=4096)(self._descendants_of)
 
         if preload:
             self.load_ontologies(Path(ontology_dir))
 
+    @staticmethod
+    def _make_graph() -> rdflib.Graph:
+        """Prefer the Oxigraph (Rust) store; fall back to rdflib's default.
+
+        Oxigraph parses turtle/RDF-XML and answers SPARQL an order of
+        magnitude faster than the pure-Python store, which dominates
+        cold-start time on real LOINC/MONDO loads.
+        """
+        try:
+            return rdflib.Graph(store="Oxigraph")
+        except Exception:
+            return rdflib.Graph()
+
     def load_ontologies(self, base_dir: Path):
-        for pattern in ("*.ttl", "*.rdf", "*.owl"):
-            for p in base_dir.rglob(pattern):
-                try:
-                    fmt = rdflib.util.guess_format(str(p))
-                    self.graph.parse(p, format=fmt)
-                    print(f"✔ Loaded {p.relative_to(base_dir)}")
-                except Exception as exc:
-                    print(f"⚠️  Failed to load {p.name}: {exc}")
-
-    def resolve_code(self, curie: str) -> rdflib.URIRef:
+        self.load_errors = []
+        paths = sorted(
+            p for pattern in ("*.ttl", "*.rdf", "*.owl") for p in base_dir.rglob(pattern)
+        )
+
+        cache_path = self._cache_path(paths)
+        if cache_path is not None and cache_path.exists():
+            try:
+                self.graph.parse(cache_path, format="nt")
+                log.debug("Loaded ontology cache %s", cache_path)
+                self._finish_load()
+                return
+            except Exception as exc:
+                log.warning("Ignoring unreadable ontology cache %s: %s", cache_path, exc)
+
+        for p in paths:
+            try:
+                fmt = rdflib.util.guess_format(str(p))
+                self.graph.parse(p, format=fmt)
+                log.debug("Loaded %s", p.relative_to(base_dir))
+            except Exception as exc:
+                self.load_errors.append((p, exc))
+                log.warning("Failed to load %s: %s", p.name, exc)
+
+        if cache_path is not None and not self.load_errors:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                self.graph.serialize(
+                    destination=str(cache_path), format="nt", encoding="utf-8"
+                )
+            except Exception as exc:
+                log.warning("Failed to write ontology cache %s: %s", cache_path, exc)
+
+        self._finish_load()
+
+    @staticmethod
+    def _cache_path(paths: List[Path]) -> Optional[Path]:
+        """Cache file keyed by (path, size, mtime) of every source file.
+
+        Re-instantiating the service (tests, per-tenant engines) then costs
+        one N-Triples parse instead of re-parsing every ontology file.
+        """
+        if not paths:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for p in paths:
+            st = p.stat()
+            digest.update(f"{p}:{st.st_size}:{st.st_mtime_ns}".encode())
+        cache_dir = Path(
+            os.getenv("ADA_CDS_CACHE_DIR", Path.home() / ".cache" / "ada_cds")
+        )
+        return cache_dir / f"onto-{digest.hexdigest()}.nt"
+
+    def _finish_load(self) -> None:
+        self._build_closures()
+        self._equiv_cache.clear()
+        self.resolve_code.cache_clear()
+        self.label.cache_clear()
+        self.synonyms.cache_clear()
+        self.descendants.cache_clear()
+
+    def _build_closures(self) -> None:
+        """Precompute the rdfs:subClassOf transitive closure.
+
+        One BFS pass at load time turns every later `is_a` /
+        `find_lab_by_parent` call into a set lookup instead of a SPARQL
+        property-path query.
+        """
+        parents: Dict[rdflib.URIRef, Set[rdflib.URIRef]] = defaultdict(set)
+        for child, _, parent in self.graph.triples((None, RDFS.subClassOf, None)):
+            parents[child].add(parent)
+
+        ancestors: Dict[rdflib.URIRef, FrozenSet[rdflib.URIRef]] = {}
+        for node in parents:
+            seen: Set[rdflib.URIRef] = set()
+            stack = list(parents[node])
+            while stack:
+                p = stack.pop()
+                if p not in seen:
+                    seen.add(p)
+                    stack.extend(parents.get(p, ()))
+            ancestors[node] = frozenset(seen)
+
+        descendants: Dict[rdflib.URIRef, Set[rdflib.URIRef]] = defaultdict(set)
+        for child, ancs in ancestors.items():
+            for anc in ancs:
+                descendants[anc].add(child)
+
+        self._ancestors = ancestors
+        self._descendants = {k: frozenset(v) for k, v in descendants.items()}
+
+    def _expand_curie(self, curie: str) -> rdflib.URIRef:
+        """CURIE -> URIRef, cached so each distinct CURIE is parsed once.
+
+        Prefix matching is case-insensitive ("MONDO:..." and "mondo:..."
+        both resolve); codes without a known prefix fall back to the local
+        `ex` namespace.
+        """
+        uri = self._curie_cache.get(curie)
+        if uri is None:
+            prefix, sep, code = curie.partition(":")
+            namespace = self.ns.get(prefix.lower()) if sep else None
+            uri = namespace[code] if namespace is not None else self.ns["ex"][curie]
+            self._curie_cache[curie] = uri
+        return uri
+
+    def _resolve_code(self, curie: str) -> rdflib.URIRef:
         """Expand CURIE -> URI and follow owl:sameAs / skos:exactMatch."""
-        ns, code = curie.split(":")
-        uri = self.ns[ns][code]
         return self.equivalent(curie)[0]
 
-    def label(self, uri: rdflib.URIRef) -> str:
+    def _label(self, uri: rdflib.URIRef) -> str:
         lbl = self.graph.value(uri, RDFS.label)
         if lbl:
             return str(lbl)
@@ -50,51 +177,43 @@ class OntologyService:
                 return f"{pfx}:{uri.split(str(ns))[-1]}"
         return str(uri)
 
-    def synonyms(self, uri: rdflib.URIRef) -> List[str]:
+    def _synonyms(self, uri: rdflib.URIRef) -> Tuple[str, ...]:
         syn = {str(self.graph.value(uri, RDFS.label))}
         for lit in self.graph.objects(uri, SKOS.altLabel):
             syn.add(str(lit))
         for eq in self.graph.objects(uri, OWL.equivalentClass):
             syn.add(self.label(eq))
-        return [s for s in syn if s]
+        return tuple(s for s in syn if s)
 
     def is_a(self, child: rdflib.URIRef, parent: rdflib.URIRef) -> bool:
         """Transitive subclass reasoning (rdfs:subClassOf+)."""
-        q = """
-        ASK {
-            ?child rdfs:subClassOf+ ?parent .
-        }
-        """
-        return bool(
-            self.graph.query(
-                q,
-                initBindings={"child": child, "parent": parent},
-            )
-        )
+        return parent in self._ancestors.get(child, ())
+
+    def _descendants_of(self, uri: rdflib.URIRef) -> FrozenSet[rdflib.URIRef]:
+        """All subclasses of `uri`, itself included (rdfs:subClassOf*)."""
+        return self._descendants.get(uri, frozenset()) | {uri}
 
     def equivalent(self, curie: str) -> List[rdflib.URIRef]:
-        """Collect owl:sameAs / skos:exactMatch for a CURIE."""
-        ns, code = curie.split(":")
-        uri = self.ns[ns][code]
-        matches = {uri}
-        for eq in self.graph.objects(uri, OWL.sameAs):
-            matches.add(eq)
-        for eq in self.graph.objects(uri, SKOS.exactMatch):
-            matches.add(eq)
-        return list(matches)
+        """Collect owl:sameAs / skos:exactMatch for a CURIE.
+
+        The expanded URI always comes first; results are cached per CURIE.
+        """
+        cached = self._equiv_cache.get(curie)
+        if cached is None:
+            uri = self._expand_curie(curie)
+            matches = [uri]
+            for pred in (OWL.sameAs, SKOS.exactMatch):
+                for eq in self.graph.objects(uri, pred):
+                    if eq not in matches:
+                        matches.append(eq)
+            cached = tuple(matches)
+            self._equiv_cache[curie] = cached
+        return list(cached)
 
     def find_lab_by_parent(self, parent_curie: str) -> List[rdflib.URIRef]:
         """All LOINC children of a parent LOINC concept."""
         parent_uri = self.resolve_code(parent_curie)
-        q = """
-        SELECT ?lab WHERE {
-            ?lab rdfs:subClassOf+ ?parent .
-        }
-        """
-        return [
-            row.lab
-            for row in self.graph.query(q, initBindings={"parent": parent_uri})
-        ]
+        return list(self._descendants.get(parent_uri, ()))
 
     def serialize(self, fmt: str = "turtle") -> str:
         return self.graph.serialize(format=fmt).decode()
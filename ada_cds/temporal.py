@@ -1,5 +1,6 @@
+from contextlib import contextmanager
 from datetime import date
-from typing import Any, Optional, Tuple
+from typing import Any, Iterator, Optional, Tuple
 
 from .config import ConfigManager
 
@@ -9,20 +10,42 @@ class TemporalEngine:
 
     def __init__(self, config: ConfigManager):
         self.config = config
+        self._today: Optional[date] = None
+
+    @contextmanager
+    def request_scope(self, today: Optional[date] = None) -> Iterator["TemporalEngine"]:
+        """Pin 'today' for the duration of a request.
+
+        date.today() pays a clock syscall plus construction per call; rule
+        loops invoke the helpers below many times, so callers wrap one
+        request in this scope and every check reuses the captured date.
+        """
+        previous = self._today
+        self._today = today or date.today()
+        try:
+            yield self
+        finally:
+            self._today = previous
+
+    def today(self) -> date:
+        return self._today or date.today()
 
     def needs_annual_screening(
         self,
         last_date: Optional[date],
         screening_type: str,
         patient,
+        today: Optional[date] = None,
     ) -> Tuple[bool, Optional[str]]:
         """Return (needs, reason)."""
 
         if last_date is None:
             return True, "Never performed"
 
-        days_since = (date.today() - last_date).days
-        threshold = self.config.get(f"thresholds.annual_{screening_type}_days", 365)
+        days_since = ((today or self.today()) - last_date).days
+        threshold = getattr(
+            self.config.frozen.thresholds, f"annual_{screening_type}_days", 365
+        )
 
         if screening_type == "eye_exam" and patient.diabetes_complications:
             threshold = 180
@@ -31,18 +54,23 @@ class TemporalEngine:
             return True, f"Last performed {days_since} days ago"
         return False, None
 
-    def is_lab_current(self, lab: Optional[Any], lab_type: str) -> Tuple[bool, Optional[str]]:
+    def is_lab_current(
+        self,
+        lab: Optional[Any],
+        lab_type: str,
+        today: Optional[date] = None,
+    ) -> Tuple[bool, Optional[str]]:
         """Validate recency of a lab."""
         if lab is None:
             return False, "No lab result"
 
-        days_old = (date.today() - lab.date).days
-        recency = self.config.get(f"thresholds.{lab_type}_recency_days", 90)
+        days_old = ((today or self.today()) - lab.date).days
+        recency = getattr(self.config.frozen.thresholds, f"{lab_type}_recency_days", 90)
 
         if days_old > recency:
             return False, f"{days_old} days old (max {recency})"
         return True, None
 
-    def medication_duration(self, medication) -> int:
-        end = medication.end_date or date.today()
+    def medication_duration(self, medication, today: Optional[date] = None) -> int:
+        end = medication.end_date or today or self.today()
         return (end - medication.start_date).days
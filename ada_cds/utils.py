@@ -1,22 +1,22 @@
-from typing import List, Tuple
+import re
+
+_PREFIX_MAP = {
+    "loinc.org": "LOINC",
+    "rxnorm.info": "rxnorm",
+    "purl.obolibrary.org": "MONDO",
+    "snomed.info": "SNOMED",
+}
+
+# One precompiled pattern instead of per-call splits: the regex pulls the
+# domain and the final path segment in a single pass.
+_CURIE_RE = re.compile(r"^https?://(?P<dom>[^/]+)/(?:.*/)?(?P<local>[^/]+)$")
 
 
 def extract_curie(uri: str) -> str:
     """
     Turn a full URI into a CURIE (prefix:local). Very simple heuristic.
     """
-    if "://" not in uri:
+    m = _CURIE_RE.match(uri)
+    if m is None:
         return uri
-    parts = uri.split("/")
-    local = parts[-1]
-    domain = uri.split("//")[1].split("/")[0]
-    prefix_map = {
-        "loinc.org": "LOINC",
-        "rxnorm.info": "rxnorm",
-        "purl.obolibrary.org": "MONDO",
-        "snomed.info": "SNOMED",
-    }
-    for dom, pref in prefix_map.items():
-        if dom in domain:
-            return f"{pref}:{local}"
-    return f"ex:{local}"
+    return f"{_PREFIX_MAP.get(m['dom'], 'ex')}:{m['local']}"
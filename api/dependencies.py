@@ -28,3 +28,18 @@ def _engine_for_tenant(tenant_id: Optional[str]) -> EnhancedADAReasoningEngine:
 
 def get_engine(x_tenant_id: Optional[str] = Header(None)) -> EnhancedADAReasoningEngine:
     return _engine_for_tenant(x_tenant_id)
+
+
+def warm_engines() -> None:
+    """Instantiate engines for every configured tenant ahead of traffic.
+
+    Engine construction pays the full ontology load, so without this the
+    first request per tenant absorbs that latency. Called from the app
+    startup hook.
+    """
+    _engine_for_tenant(None)
+    config_dir = Path(os.getenv("CONFIG_DIR", "./configs/tenants"))
+    if config_dir.is_dir():
+        for path in sorted(config_dir.iterdir()):
+            if path.suffix in (".json", ".yaml", ".yml"):
+                _engine_for_tenant(path.stem)
@@ -1,56 +1,69 @@
+import hmac
 import os
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException
 
 from ada_cds.engine import EnhancedADAReasoningEngine
+from ada_cds.models import Diagnosis, LabResult, Medication, Patient, VitalSigns
 from api.dependencies import get_engine
 from api.schemas import EvaluationResponse, PatientRequest
 
+_API_KEY = os.getenv("API_KEY", "demo-key")
+
 router = APIRouter()
 
 
+def require_api_key(x_api_key: Optional[str] = Header(None)) -> None:
+    """Constant-time API-key check, run as a dependency before the handler."""
+    if not hmac.compare_digest(x_api_key or "", _API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "ok"}
 
 
-@router.post("/evaluate", response_model=EvaluationResponse)
+@router.post(
+    "/evaluate",
+    response_model=EvaluationResponse,
+    dependencies=[Depends(require_api_key)],
+)
 async def evaluate_patient(
     payload: PatientRequest,
+    background_tasks: BackgroundTasks,
     engine: EnhancedADAReasoningEngine = Depends(get_engine),
-    x_api_key: Optional[str] = Header(None),
 ):
-    expected_key = os.getenv("API_KEY", "demo-key")
-    if x_api_key != expected_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     if payload.clinician_id:
         engine.set_clinician(payload.clinician_id)
 
-    from ada_cds.models import Diagnosis, LabResult, Medication, Patient, VitalSigns
-
     patient = Patient(
         patient_id=payload.patient_id,
         mrn=payload.mrn,
         age=payload.age,
         sex=payload.sex,
-        diagnoses=[Diagnosis(**d.dict()) for d in payload.diagnoses],
-        labs=[LabResult(**l.dict()) for l in payload.labs],
-        medications=[Medication(**m.dict()) for m in payload.medications],
-        vital_signs=VitalSigns(**(payload.vital_signs.dict() if payload.vital_signs else {})),
+        diagnoses=[Diagnosis.from_schema(d) for d in payload.diagnoses],
+        labs=[LabResult.from_schema(l) for l in payload.labs],
+        medications=[Medication.from_schema(m) for m in payload.medications],
+        vital_signs=(
+            VitalSigns.from_schema(payload.vital_signs)
+            if payload.vital_signs
+            else VitalSigns()
+        ),
         pregnant=payload.pregnant,
         payer=payload.payer,
     )
 
-    out = engine.evaluate(patient)
+    out, persist_audit = engine.evaluate_clinical(patient)
+    background_tasks.add_task(persist_audit)
 
     return EvaluationResponse(
         evaluation_id=out.audit_trail_id,
-        timestamp=out.timestamp.isoformat(),
+        timestamp=out.timestamp,
         validation={"errors": out.validation.errors, "warnings": out.validation.warnings},
-        eligibility={k: v.__dict__ for k, v in out.eligibility.items()},
+        eligibility=out.eligibility,
         care_gaps=out.care_gaps,
         audit_trail_id=out.audit_trail_id,
-        metadata=out.validation.__dict__,
+        metadata={"errors": out.validation.errors, "warnings": out.validation.warnings},
     )
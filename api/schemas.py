@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, validator
@@ -66,10 +66,15 @@ class EligibilityItem(BaseModel):
     prior_auth_required: bool = False
     estimated_coverage: Optional[str] = None
 
+    class Config:
+        # Lets the engine's result objects be passed directly instead of
+        # being copied through __dict__ first.
+        orm_mode = True
+
 
 class EvaluationResponse(BaseModel):
     evaluation_id: str
-    timestamp: str
+    timestamp: datetime
     validation: Dict[str, List[str]]
     eligibility: Dict[str, EligibilityItem]
     care_gaps: List[Dict[str, str]]
@@ -1,16 +1,24 @@
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from api import router
+from api.dependencies import warm_engines
 
 app = FastAPI(
     title="ADA Clinical Reasoning Engine v3",
     description="SaaS-ready CDS for diabetes management (ontology-driven)",
     version="3.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(router)
 
+
+@app.on_event("startup")
+async def _warm() -> None:
+    warm_engines()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,39 @@
+import datetime as dt
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+PAYLOAD = {
+    "patient_id": "T001",
+    "age": 58,
+    "sex": "M",
+    "diagnoses": [{"icd10": "E11.9", "mondo": "MONDO:0005148", "name": "Type 2 Diabetes"}],
+    "labs": [
+        {
+            "loinc": "LOINC:4548-4",
+            "value": 9.6,
+            "unit": "%",
+            "date": (dt.date.today() - dt.timedelta(days=30)).isoformat(),
+        }
+    ],
+    "medications": [],
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as c:
+        yield c
+
+
+def test_rejects_missing_or_wrong_api_key(client):
+    assert client.post("/evaluate", json=PAYLOAD).status_code == 401
+    assert client.post("/evaluate", json=PAYLOAD, headers={"x-api-key": "wrong"}).status_code == 401
+
+
+def test_accepts_valid_api_key(client):
+    response = client.post("/evaluate", json=PAYLOAD, headers={"x-api-key": "demo-key"})
+    assert response.status_code == 200
+    assert "GLP1" in response.json()["eligibility"]
@@ -0,0 +1,41 @@
+import datetime as dt
+
+from ada_cds.audit import AuditLogger
+
+
+class _StubPatient:
+    patient_id = "P001"
+    age = 60
+    sex = "F"
+    diagnoses = []
+    labs = []
+    medications = []
+    payer = "medicare"
+
+
+def test_flush_keeps_every_entry_past_buffer_size():
+    logger = AuditLogger(buffer_size=10, flush_interval=3600)
+    base = dt.datetime(2026, 8, 26, tzinfo=dt.timezone.utc)
+    for i in range(25):
+        logger.log_evaluation(_StubPatient(), None, {}, {}, timestamp=base + dt.timedelta(seconds=i))
+    logger.flush()
+    assert len(logger.entries) == 25
+
+
+def test_export_window_with_out_of_order_flushes():
+    logger = AuditLogger(buffer_size=100, flush_interval=3600)
+    base = dt.datetime(2026, 8, 26, tzinfo=dt.timezone.utc)
+    for minute in (5, 1, 3):
+        logger.log_evaluation(_StubPatient(), None, {}, {}, timestamp=base + dt.timedelta(minutes=minute))
+        logger.flush()
+    events = list(
+        logger.export_fhir_audit(base + dt.timedelta(minutes=2), base + dt.timedelta(minutes=10))
+    )
+    assert len(events) == 2
+
+
+def test_disabled_logger_writes_nothing():
+    logger = AuditLogger(enabled=False)
+    assert logger.log_evaluation(_StubPatient(), None, {}, {}) == ""
+    logger.flush()
+    assert logger.entries == []
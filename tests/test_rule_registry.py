@@ -0,0 +1,93 @@
+import datetime as dt
+import random
+from pathlib import Path
+
+import pytest
+import rdflib
+
+from ada_cds.config import ConfigManager
+from ada_cds.models import Diagnosis, LabResult, Medication, Patient
+from ada_cds.ontology_service import OntologyService
+from ada_cds.rule_registry import RuleRegistry, _query_curie_set
+from ada_cds.temporal import TemporalEngine
+from ada_cds.utils import extract_curie
+
+
+@pytest.fixture(scope="module")
+def registry():
+    config = ConfigManager(Path("./configs/default.json"))
+    return RuleRegistry(config, OntologyService(Path("./ontologies")))
+
+
+@pytest.fixture(scope="module")
+def temporal(registry):
+    return TemporalEngine(registry.config)
+
+
+def _random_patient(rng, i):
+    today = dt.date.today()
+    labs = []
+    if rng.random() < 0.8:
+        labs.append(
+            LabResult("LOINC:4548-4", rng.uniform(5, 12), "%", today - dt.timedelta(days=rng.randrange(400)))
+        )
+    if rng.random() < 0.5:
+        labs.append(
+            LabResult("LOINC:48643-1", rng.uniform(5, 90), "mL/min", today - dt.timedelta(days=rng.randrange(400)))
+        )
+    if rng.random() < 0.5:
+        labs.append(
+            LabResult("LOINC:9318-7", rng.uniform(5, 300), "mg/g", today - dt.timedelta(days=rng.randrange(400)))
+        )
+    diagnoses = []
+    if rng.random() < 0.7:
+        diagnoses.append(Diagnosis(icd10="E11.9", mondo="MONDO:0005148", name="T2DM"))
+    medications = []
+    if rng.random() < 0.6:
+        medications.append(Medication("rxnorm:6809", "Metformin", today - dt.timedelta(days=400)))
+    if rng.random() < 0.3:
+        medications.append(Medication("rxnorm:2618", "Insulin", today - dt.timedelta(days=100)))
+    return Patient(
+        patient_id=f"P{i:03d}",
+        age=rng.randrange(18, 90),
+        sex=rng.choice("MF"),
+        diagnoses=diagnoses,
+        labs=labs,
+        medications=medications,
+        pregnant=rng.random() < 0.1,
+        payer=rng.choice(["medicare", "medicaid", "commercial", None]),
+    )
+
+
+def test_cohort_matches_scalar_evaluation(registry, temporal):
+    rng = random.Random(20260826)
+    cohort = [_random_patient(rng, i) for i in range(60)]
+    vector = registry.evaluate_cohort(cohort, temporal)
+    assert set(vector) == set(registry.rules)
+    for rule_id, mask in vector.items():
+        rule = registry.rules[rule_id]
+        for patient, got in zip(cohort, mask):
+            assert bool(got) == rule.evaluate(patient, registry.config, temporal)[0]
+
+
+def test_evaluate_fast_matches_full_evaluation(registry, temporal):
+    rng = random.Random(99)
+    for i in range(30):
+        patient = _random_patient(rng, i)
+        for rule in registry.rules.values():
+            fast = rule.evaluate_fast(patient, registry.config, temporal)
+            assert fast == rule.evaluate(patient, registry.config, temporal)[0]
+
+
+def test_query_curie_set_matches_sparql():
+    ontology = OntologyService(preload=False)
+    rx = rdflib.Namespace("http://rxnorm.info/rdf/")
+    graph = rdflib.Graph()
+    graph.add((rx["111"], rdflib.RDFS.subClassOf, rx["8600"]))
+    graph.add((rx["222"], rdflib.RDFS.subClassOf, rx["111"]))
+    ontology.graph = graph
+    ontology._finish_load()
+
+    query = "SELECT ?rx WHERE { ?rx rdfs:subClassOf+ <http://rxnorm.info/rdf/8600> . }"
+    sparql = frozenset(extract_curie(str(row[0])) for row in graph.query(query))
+    assert _query_curie_set(ontology, query) == sparql == {"rxnorm:111", "rxnorm:222"}